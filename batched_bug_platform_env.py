@@ -0,0 +1,184 @@
+import numpy as np
+from numba import njit, prange
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+
+from bug_platform_env_v1 import (BugPlatformEnv, _step_kernel,
+                                 _EP_X, _EP_Y, _EP_VX, _EP_VY, _EP_JCD)
+
+
+# All N envs are stepped by one compiled call instead of N Python step()
+# calls behind pickle/IPC (SubprocVecEnv) or a GIL-serialized loop
+# (DummyVecEnv). State lives in SoA float32 arrays; the per-env physics is
+# the same _step_kernel the single env uses, run across lanes with prange.
+
+@njit(parallel=True, cache=True)
+def _batched_step(ep, steps, rx_buf, rx_count, actions,
+                  out_obs, out_rew, out_term, out_trunc,
+                  plat_x1, plat_x2, plat_top, plat_x_min, plat_x_max,
+                  ground_y, ground_xl, ground_xr,
+                  dt, gravity, vx_lut, jump_speed, jump_cooldown_max,
+                  player_half_width, hitbox_height,
+                  wall_x, wall_left, wall_right, wall_height,
+                  bug_gap_y_min, bug_gap_y_max,
+                  flag_x, flag_y, speed_factor, max_steps,
+                  stagnation_window, stagnation_threshhold,
+                  inv_jump_cd_max):
+    n = ep.shape[0]
+    for i in prange(n):
+        steps[i] += 1
+
+        reward, grounded, terminated, truncated = _step_kernel(
+            ep[i], int(actions[i, 0]), int(actions[i, 1]), steps[i],
+            plat_x1, plat_x2, plat_top, plat_x_min, plat_x_max,
+            ground_y, ground_xl, ground_xr,
+            dt, gravity, vx_lut, jump_speed, jump_cooldown_max,
+            player_half_width, hitbox_height,
+            wall_x, wall_left, wall_right, wall_height,
+            bug_gap_y_min, bug_gap_y_max,
+            flag_x, flag_y, speed_factor, max_steps,
+        )
+
+        x_new = ep[i, _EP_X]
+
+        # Cycle/stuck penalty: per-lane ring buffer; once full, the whole
+        # buffer is exactly the last `stagnation_window` samples, so a
+        # compiled O(window) scan is enough. Skipped on the terminal step
+        # (episode over, lane resets anyway)
+        if not terminated:
+            w = rx_buf.shape[1]
+            rx_buf[i, rx_count[i] % w] = x_new
+            rx_count[i] += 1
+            if rx_count[i] >= stagnation_window:
+                x_min = rx_buf[i, 0]
+                x_max = rx_buf[i, 0]
+                for k in range(1, w):
+                    v = rx_buf[i, k]
+                    if v < x_min:
+                        x_min = v
+                    elif v > x_max:
+                        x_max = v
+                if (x_max - x_min) < stagnation_threshhold:
+                    reward -= 0.03
+
+        out_obs[i, 0] = x_new
+        out_obs[i, 1] = ep[i, _EP_Y]
+        out_obs[i, 2] = ep[i, _EP_VX]
+        out_obs[i, 3] = ep[i, _EP_VY]
+        out_obs[i, 4] = ep[i, _EP_JCD] * inv_jump_cd_max
+        out_obs[i, 5] = flag_x - x_new
+        out_obs[i, 6] = wall_x - x_new
+        out_obs[i, 7] = 1.0 if grounded else 0.0
+
+        out_rew[i] = reward
+        out_term[i] = terminated
+        out_trunc[i] = truncated
+
+
+class BatchedBugPlatformEnv(VecEnv):
+    """
+    N BugPlatformEnv copies stepped as one Numba-parallel batch.
+
+    Drop-in replacement for make_vec_env(BugPlatformEnv, n_envs=N): same
+    observation/action spaces and the usual VecEnv auto-reset semantics
+    (terminal observation in info["terminal_observation"]).
+    """
+
+    def __init__(self, num_envs: int = 16):
+        # A template env provides spaces, level layout, and all the physics
+        # constants (single source of truth)
+        self._env = BugPlatformEnv()
+        env = self._env
+        super().__init__(num_envs, env.observation_space, env.action_space)
+
+        n = num_envs
+        # One packed float32[8] episode-state row per lane, same layout the
+        # single env uses; the kernel mutates rows in place
+        self._ep = np.zeros((n, 8), dtype=np.float32)
+        self._steps = np.zeros(n, dtype=np.int64)
+        self._rx_buf = np.zeros((n, env.stagnation_window), dtype=np.float64)
+        self._rx_count = np.zeros(n, dtype=np.int64)
+
+        self._obs = np.zeros((n, 8), dtype=np.float32)
+        self._rewards = np.zeros(n, dtype=np.float64)
+        self._terminated = np.zeros(n, dtype=np.bool_)
+        self._truncated = np.zeros(n, dtype=np.bool_)
+
+        self._actions = None
+
+        # Compile the batched kernel up front so the first rollout doesn't
+        # pay the JIT latency. The template env already bundles the constant
+        # kernel arguments; the batched kernel just appends its own
+        self._kernel_args = (
+            *env._kernel_args,
+            env.stagnation_window, env.stagnation_threshhold,
+            env._inv_jump_cd_max,
+        )
+        self.reset()
+        _batched_step(self._ep, self._steps, self._rx_buf, self._rx_count,
+                      np.zeros((n, 2), dtype=np.int64),
+                      self._obs, self._rewards, self._terminated,
+                      self._truncated, *self._kernel_args)
+        self.reset()
+
+    def _reset_env(self, i):
+        env = self._env
+        ep = self._ep[i]
+        ep[:] = 0.0
+        ep[_EP_X] = env.start_x
+        ep[_EP_Y] = env.start_y
+        self._steps[i] = 0
+        self._rx_buf[i, 0] = env.start_x
+        self._rx_count[i] = 1
+
+        env_obs = self._obs[i]
+        env_obs[0] = env.start_x
+        env_obs[1] = env.start_y
+        env_obs[2] = 0.0
+        env_obs[3] = 0.0
+        env_obs[4] = 0.0
+        env_obs[5] = env.flag_x - env.start_x
+        env_obs[6] = env.wall_x - env.start_x
+        env_obs[7] = 1.0 if env._on_ground(env.start_x, env.start_y) else 0.0
+
+    def reset(self):
+        for i in range(self.num_envs):
+            self._reset_env(i)
+        return self._obs.copy()
+
+    def step_async(self, actions):
+        self._actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs, 2)
+
+    def step_wait(self):
+        _batched_step(self._ep, self._steps, self._rx_buf, self._rx_count,
+                      self._actions,
+                      self._obs, self._rewards, self._terminated,
+                      self._truncated, *self._kernel_args)
+
+        dones = self._terminated | self._truncated
+        infos = [{} for _ in range(self.num_envs)]
+        if dones.any():
+            for i in np.nonzero(dones)[0]:
+                infos[i]["terminal_observation"] = self._obs[i].copy()
+                infos[i]["TimeLimit.truncated"] = bool(
+                    self._truncated[i] and not self._terminated[i])
+                self._reset_env(i)
+
+        return (self._obs.copy(), self._rewards.copy(), dones.copy(), infos)
+
+    def close(self):
+        pass
+
+    def get_attr(self, attr_name, indices=None):
+        indices = self._get_indices(indices)
+        if attr_name == "state":
+            return [self._ep[i, :4] for i in indices]
+        return [getattr(self._env, attr_name) for _ in indices]
+
+    def set_attr(self, attr_name, value, indices=None):
+        raise NotImplementedError("BatchedBugPlatformEnv does not expose per-env attributes")
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        raise NotImplementedError("BatchedBugPlatformEnv does not expose per-env methods")
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
@@ -1,349 +1,430 @@
-import gymnasium as gym
-import numpy as np
-from gymnasium import spaces
-
-class BugPlatformEnv(gym.Env):
-    """
-    Simple 2D platformer with:
-    - A square player that can move left/right and jump.
-    - A wall with a tiny "buggy" gap where collision fails.
-    - A flag to the right (reaching it as fast as possible is the player's objective).
-    - Platforms to the left of the wall allow a "legitimate" way to jump -> over <- the wall.
-    """
-    metadata = {"render.modes": ["human", "rgb_array"]}
-
-    def __init__(self):
-        super().__init__()
-
-        # --- Environment constants ---
-        
-        # Misc
-        self.speed_factor = 0.1  # The higher the value, higher the reward for reaching the flag quickly
-        self.y_before_jump = 0.0
-        self.is_jumping = False
-        self.jump_cooldown = 0
-        self.jump_cooldown_max = 60
-        self.prev_jump = 0
-        
-        # Player
-        self.player_width = 0.6  # 0.6 because in render_env.py "player_size" is 18 and world scale is 30 (0.6 * 30 = 18)
-        self.player_height = 0.6
-        self.player_half_width = self.player_width / 2  # Helps so self.player_width / 2 isn't reused everywhere
-        
-        # Physics
-        self.dt = 0.02
-        self.max_steps = 1000
-        self.gravity = -30.0
-        self.move_speed = 4.0
-        self.jump_speed = 12.0
-
-        # Level layout
-        self.start_x = 1.0
-        self.start_y = 0.0
-        self.flag_x = 20.0
-        self.flag_y = 0.0
-
-        # Wall position and fake bug gap
-        self.wall_x = 10.0
-        self.wall_width = 0.6
-        self.wall_height = 7.0
-        self.bug_gap_y_min = 1.0   # Only in this vertical band can you "phase" through the wall (as if it's not there)
-        self.bug_gap_y_max = 3.0
-        
-        # Platforms to the left of the wall (x_left, x_right, y_top)
-        self.platform_thickness = 0.2
-        self.platforms = [
-            (4.0, 8.5, 1.5),
-            (6.0, 9.0, 3.0),
-            (5.0, 6.5, 4.5),
-            (7.0, 10.0, 6.0),
-        ]
-
-        # --- State variables ---
-        
-        
-        # [x, y, vx, vy]
-        low = np.array([-np.inf, -np.inf, -np.inf, -np.inf, 0.0, -np.inf, -np.inf, 0.0], dtype=np.float32)
-        high = np.array([np.inf, np.inf, np.inf, np.inf, 1.0, np.inf, np.inf, 1.0], dtype=np.float32)
-        self.observation_space = spaces.Box(low=low, high=high, dtype=np.float32)
-
-        self.action_space = spaces.MultiDiscrete([3, 2])
-
-        self.state = None
-        self.steps = 0
-
-        # For rendering (only used in visualize.py)
-        self._viewer_initialized = False
-
-
-    # -----------------------------------------------------------
-    # Core RL interface (no Pygame - Better training efficiency)
-    # -----------------------------------------------------------
-    
-    def reset(self, *, seed=None, options=None):
-        # Resets the environment before each step
-        super().reset(seed=seed)
-        
-        self.jump_cooldown = 0
-        self.is_jumping = False
-        self.prev_jump = 0
-        
-        self.state = np.array([
-            self.start_x,
-            self.start_y,
-            0.0,
-            0.0,
-            ], dtype=np.float32)
-        
-        self.steps = 0
-        
-        obs = self._get_obs()
-        info = {} # PLACEHOLDER (potential future logging)
-        return obs, info
-
-
-    def step(self, action):
-        # "Real time" character control and physics logics
-        reward = 0.0
-        
-        if self.jump_cooldown > 0:
-            self.jump_cooldown -= 1
-        
-        x, y, vx, vy = self.state
-        self.steps += 1
-
-        movement, jump = action
-        
-        # To stop jump spamming
-        if jump == 1:
-            reward -= 0.02
-        
-        jump_pressed = (jump == 1 and self.prev_jump == 0)
-        
-        # Horizontal control
-        if movement == 1:         # left
-            vx = -self.move_speed
-        elif movement == 2:       # right
-            vx = self.move_speed
-        else:
-            vx = 0.0
-
-        # Jump: only if "on the ground"
-        if jump_pressed and vy < 0.001 and self.jump_cooldown == 0:
-            if self._on_ground(x, y):
-                self.y_before_jump = y
-                self.is_jumping = True
-                
-                self.jump_cooldown = self.jump_cooldown_max
-                
-                vy = self.jump_speed
-        
-        # You have to release jump to be able to jump again
-        self.prev_jump = jump
-
-        # Apply gravity
-        vy += self.gravity * self.dt
-
-        # Integrate position
-        x_new = x + vx * self.dt
-        y_new = y + vy * self.dt
-
-        # Ground collision
-        if y_new < 0.0:
-            y_new = 0.0
-            vy = 0.0
-
-        # Platform collision
-        if vy < 0.0: # "Falling"
-            for (px1, px2, py) in self.platforms:
-                if (y >= py + self.platform_thickness) and (y_new <= py + self.platform_thickness):
-                    player_left_new = x_new - self.player_half_width
-                    player_right_new = x_new + self.player_half_width
-
-                    is_over_platform = (player_right_new > px1) and (player_left_new < px2)
-                    
-                    if is_over_platform:
-                        y_new = py + self.platform_thickness
-                        vy = 0.0
-                        break
-
-        
-        # Wall collision with a tiny "bug gap"
-        # Normal collision: block movement through wall_x +/- wall_width/2
-        # Except if y is in [bug_gap_y_min, bug_gap_y_max]
-        
-        # Numpy coordinates are centered, these are the wall's boundaries
-        wall_left = self.wall_x - (self.wall_width / 2)
-        wall_right = self.wall_x + (self.wall_width / 2)
-        
-        # Player collision conditionals, including fake bug handling
-        player_left_new = x_new - self.player_half_width
-        player_right_new = x_new + self.player_half_width
-        player_bottom_new = y_new
-        player_top_new = y_new + self.player_height
-        
-        inside_wall_vertical = (player_bottom_new < self.wall_height) and (player_top_new > 0.0)
-        inside_wall_horizontal = (player_right_new > wall_left) and (player_left_new < wall_right)
-
-        in_bug_gap = self.bug_gap_y_min <= y <= self.bug_gap_y_max
-        
-        # entering_from_left = (x < wall_left) and (x_new >= wall_left)
-        # entering_from_right = (x > wall_right) and (x_new <= wall_right)
-        within_wall_height = (y < self.wall_height)
-
-        
-        if inside_wall_horizontal and inside_wall_vertical:
-            if in_bug_gap:
-                if player_bottom_new <= self.bug_gap_y_min:
-                    y_new = self.bug_gap_y_min
-                    vy = 0.0
-                elif player_top_new >= self.bug_gap_y_max:
-                    y_new = self.bug_gap_y_max - self.player_height
-
-            elif not within_wall_height:
-                if player_bottom_new <= self.wall_height:
-                    y_new = self.wall_height
-                    vy = 0.0
-            
-            elif x < self.wall_x:
-                x_new = wall_left - self.player_half_width
-                vx = 0.0
-            else:
-                x_new = wall_right + self.player_half_width
-                vx = 0.0
-        
-        # if (wall_left <= x_new <= wall_right) and within_wall_height:
-        #     if vx > 0:  # Coming from the left
-        #         x_new = wall_left
-        #     elif vx < 0:  # Coming from the right
-        #         x_new = wall_right
-        #     else:
-        #         if x < self.wall_x:
-        #             x_new = wall_left
-        #         else:
-        #             x_new = wall_right
-        #     vx = 0.0
-            
-            
-            # if not (self.bug_gap_y_min <= y_new <= self.bug_gap_y_max):
-            #     # Proper collision: stop at wall
-            #     x_new = wall_left - 1
-            #     vx = 0.0
-            # else:
-            #     # Bug: allow phasing through (no correction)
-            #     pass
-        
-        # if entering_from_right and within_wall_height:
-        #     if not (self.bug_gap_y_min <= y_new <= self.bug_gap_y_max):
-        #         # Proper collision: stop at wall
-        #         x_new = wall_right
-        #         vx = 0.0
-        #     else:
-        #         # Bug: allow phasing through (no correction)
-        #         pass
-
-        self.state = np.array([x_new, y_new, vx, vy], dtype=np.float32)
-
-        # Reward: shaped for reaching flag fast
-        eps = 0.001
-
-        # Height and lower distance to the flag are good
-        dist_prev = abs(self.flag_x - x)
-        dist_curr = abs(self.flag_x - x_new)
-        
-        
-        reward += (dist_prev - dist_curr) / 5
-        if y_new - y > 0:
-            reward += (y_new - y) / 5
-
-        # Step penalty to encourage speed
-        reward -= 0.01
-        
-        # Staying still penalty
-        if abs(vx) < eps and not self.is_jumping:
-            reward -= 0.05
-        
-        # Jump penalty/reward
-        if self.is_jumping and self._on_ground(x_new, y_new) and abs(vy) < eps:
-            height_gained = y_new - self.y_before_jump
-            
-            # Gained no height after jump
-            if height_gained < -0.2:
-                pass
-            elif height_gained < 0.2:
-                reward -= 1.0
-            # Gained some height after jump
-            else:
-                reward += 0.2
-            
-            self.is_jumping = False
-
-        # Termination conditions
-        terminated = False      # Reached the goal
-        truncated = False       # Timed out
-        
-        # Success condition
-        if self._reached_flag(x_new, y_new):
-            time_left = self.max_steps - self.steps
-            reward += 10.0 + (self.speed_factor * time_left)
-            terminated = True
-
-        # Time limit
-        if self.steps >= self.max_steps:
-            truncated = True
-
-        info = {}
-        obs = self._get_obs()
-        
-        
-        return obs, reward, terminated, truncated, info
-
-    def _get_obs(self):
-        x, y, vx, vy = self.state
-        
-        cooldown_norm = self.jump_cooldown / self.jump_cooldown_max
-        
-        distance_to_flag = self.flag_x - x
-        distance_to_wall = self.wall_x - x
-        
-        grounded = 1.0 if self._on_ground(x, y) else 0.0
-        
-        return np.array([x, y, vx, vy, cooldown_norm, distance_to_flag, distance_to_wall, grounded], dtype=np.float32)
-
-    # Checks if it's standing on a surface
-    def _on_ground(self, x, y, eps = 0.001):
-        player_left = x - self.player_half_width
-        player_right = x + self.player_half_width
-        
-        # Ground
-        if abs(np.float32(y)) < eps:
-            return True
-
-        # Platforms
-        for (px1, px2, py) in self.platforms:
-            if (abs(y - (py + self.platform_thickness)) < eps):
-                is_over_platform = (player_right > px1) and (player_left < px2)
-                if is_over_platform:
-                    return True
-        
-        # Wall (and wall "hole")
-        if (abs(y - self.wall_height) < eps):
-            return True
-        elif (abs(y - self.bug_gap_y_min) < eps):
-            return True
-        
-        return False
-
-    def _reached_flag(self, x, y):
-        return abs(x - self.flag_x) < 0.5 and abs(y - self.flag_y) < 0.5
-
-    # --------------------------------------------------
-    # Rendering: will be implemented with Pygame in visualize.py
-    # --------------------------------------------------
-    def render(self, mode="human"):
-        # Placeholder; in visualize.py you can import Pygame and
-        # implement actual drawing using self.state and level layout.
-        pass
-
-    def close(self):
-        pass
+import gymnasium as gym
+import numpy as np
+from math import fabs
+from gymnasium import spaces
+from numba import njit
+
+
+# Compiled physics kernel: the whole per-step simulation (control, gravity,
+# collisions, reward shaping) runs here instead of the Python interpreter.
+# cache=True keeps the compiled code on disk between runs.
+
+# Mutable episode state is packed into one contiguous float32[8] buffer the
+# kernel mutates in place (slot indices below), so step() never marshals it
+# through Python attributes
+_EP_X, _EP_Y, _EP_VX, _EP_VY, _EP_JCD, _EP_ISJUMP, _EP_YBJ, _EP_PREVJUMP = range(8)
+
+
+@njit(cache=True, fastmath=True)
+def _on_ground_kernel(x, y, ground_y, ground_xl, ground_xr, player_half_width, eps):
+    # Unified surface table: ground, platform tops, wall top and the bug gap
+    # lip are all rows of (y level, x span); levels with no horizontal gating
+    # carry +/-inf spans, so one tight loop covers every standable surface
+    player_left = x - player_half_width
+    player_right = x + player_half_width
+
+    for i in range(ground_y.shape[0]):
+        if abs(y - ground_y[i]) < eps \
+                and player_right > ground_xl[i] and player_left < ground_xr[i]:
+            return True
+
+    return False
+
+
+@njit(cache=True, fastmath=True)
+def _step_kernel(ep, movement, jump, steps, plat_x1, plat_x2, plat_top,
+                 plat_x_min, plat_x_max, ground_y, ground_xl, ground_xr,
+                 dt, gravity, vx_lut, jump_speed, jump_cooldown_max,
+                 player_half_width, player_height,
+                 wall_x, wall_left, wall_right, wall_height, bug_gap_y_min, bug_gap_y_max,
+                 flag_x, flag_y, speed_factor, max_steps):
+    x = ep[_EP_X]
+    y = ep[_EP_Y]
+    vy = ep[_EP_VY]
+    is_jumping = ep[_EP_ISJUMP] != 0.0
+    y_before_jump = ep[_EP_YBJ]
+
+    reward = 0.0
+
+    jump_cooldown = max(0, int(ep[_EP_JCD]) - 1)
+
+    # To stop jump spamming (branchless: jump is 0 or 1)
+    reward -= 0.02 * jump
+
+    jump_pressed = (jump == 1 and ep[_EP_PREVJUMP] == 0.0)
+
+    # Horizontal control: LUT indexed by the movement action
+    # (0 -> 0, 1 -> -move_speed, 2 -> +move_speed), no branching
+    vx = vx_lut[movement]
+
+    # Jump: only if "on the ground"
+    if jump_pressed and vy < 0.001 and jump_cooldown == 0:
+        if _on_ground_kernel(x, y, ground_y, ground_xl, ground_xr,
+                             player_half_width, 0.001):
+            y_before_jump = y
+            is_jumping = True
+
+            jump_cooldown = jump_cooldown_max
+
+            vy = jump_speed
+
+    # Apply gravity
+    vy += gravity * dt
+
+    # Integrate position
+    x_new = x + vx * dt
+    y_new = y + vy * dt
+
+    # Ground collision
+    if y_new < 0.0:
+        y_new = 0.0
+        vy = 0.0
+
+    # Platform collision (broad-phase x-span reject before the loop)
+    if vy < 0.0 and (x_new + player_half_width) > plat_x_min \
+            and (x_new - player_half_width) < plat_x_max:  # "Falling"
+        for i in range(plat_top.shape[0]):
+            if (y >= plat_top[i]) and (y_new <= plat_top[i]):
+                player_left_new = x_new - player_half_width
+                player_right_new = x_new + player_half_width
+
+                is_over_platform = (player_right_new > plat_x1[i]) and (player_left_new < plat_x2[i])
+
+                if is_over_platform:
+                    y_new = plat_top[i]
+                    vy = 0.0
+                    break
+
+    # Wall collision with a tiny "bug gap"
+    # Normal collision: block movement through wall_x +/- wall_width/2
+    # Except if y is in [bug_gap_y_min, bug_gap_y_max]
+
+    # Player collision conditionals, including fake bug handling.
+    # Cheap horizontal reject first: in the common case the player is nowhere
+    # near the wall and the whole block is skipped.
+    player_left_new = x_new - player_half_width
+    player_right_new = x_new + player_half_width
+
+    inside_wall_horizontal = (player_right_new > wall_left) and (player_left_new < wall_right)
+
+    if inside_wall_horizontal:
+        player_bottom_new = y_new
+        player_top_new = y_new + player_height
+
+        inside_wall_vertical = (player_bottom_new < wall_height) and (player_top_new > 0.0)
+
+        in_bug_gap = bug_gap_y_min <= y <= bug_gap_y_max
+
+        within_wall_height = (y < wall_height)
+
+        if inside_wall_vertical:
+            if in_bug_gap:
+                if player_bottom_new <= bug_gap_y_min:
+                    y_new = bug_gap_y_min
+                    vy = 0.0
+                elif player_top_new >= bug_gap_y_max:
+                    y_new = bug_gap_y_max - player_height
+
+            elif not within_wall_height:
+                if player_bottom_new <= wall_height:
+                    y_new = wall_height
+                    vy = 0.0
+
+            elif x < wall_x:
+                x_new = wall_left - player_half_width
+                vx = 0.0
+            else:
+                x_new = wall_right + player_half_width
+                vx = 0.0
+
+    # On-ground at the new position feeds both the jump-landing reward and
+    # the grounded observation, so compute it once here
+    grounded_new = _on_ground_kernel(x_new, y_new, ground_y, ground_xl,
+                                     ground_xr, player_half_width, 0.001)
+
+    # Success condition checked first: when this step reaches the flag the
+    # episode is over, so none of the shaping below matters and the whole
+    # block is skipped in favor of the terminal reward
+    if abs(x_new - flag_x) < 0.5 and abs(y_new - flag_y) < 0.5:
+        time_left = max_steps - steps
+        reward += 10.0 + (speed_factor * time_left)
+        ep[_EP_X] = x_new
+        ep[_EP_Y] = y_new
+        ep[_EP_VX] = vx
+        ep[_EP_VY] = vy
+        ep[_EP_JCD] = jump_cooldown
+        ep[_EP_ISJUMP] = 1.0 if is_jumping else 0.0
+        ep[_EP_YBJ] = y_before_jump
+        # You have to release jump to be able to jump again
+        ep[_EP_PREVJUMP] = jump
+        return reward, grounded_new, True, False
+
+    # Reward: shaped for reaching flag fast
+    eps = 0.001
+
+    # Height and lower distance to the flag are good
+    dist_prev = abs(flag_x - x)
+    dist_curr = abs(flag_x - x_new)
+
+    reward += (dist_prev - dist_curr) / 5
+    reward += max(0.0, y_new - y) / 5
+
+    # Step penalty to encourage speed
+    reward -= 0.01
+
+    # Staying still penalty
+    reward -= 0.05 * ((abs(vx) < eps) and (not is_jumping))
+
+    # Jump penalty/reward
+    if is_jumping and abs(vy) < eps and grounded_new:
+        height_gained = y_new - y_before_jump
+
+        # Gained no height after jump: 0; barely any: penalty; real height:
+        # small bonus (compare-select instead of an if/elif chain)
+        reward += (-1.0 if height_gained < 0.2 else 0.2) * (height_gained >= -0.2)
+
+        is_jumping = False
+
+    # Time limit (the success case returned above)
+    truncated = steps >= max_steps
+
+    ep[_EP_X] = x_new
+    ep[_EP_Y] = y_new
+    ep[_EP_VX] = vx
+    ep[_EP_VY] = vy
+    ep[_EP_JCD] = jump_cooldown
+    ep[_EP_ISJUMP] = 1.0 if is_jumping else 0.0
+    ep[_EP_YBJ] = y_before_jump
+    # You have to release jump to be able to jump again
+    ep[_EP_PREVJUMP] = jump
+    return reward, grounded_new, False, truncated
+
+
+# Level layout shared by every env copy: platforms never change per instance,
+# so the SoA columns and the unified surface table are built once at module
+# scope (read-only) and aliased by each __init__. With many parallel envs
+# they all hit the same cache lines instead of one copy per env.
+_PLATFORM_THICKNESS = 0.2
+_PLATFORMS = [
+    (4.0, 8.5, 1.5),
+    (6.0, 9.0, 3.0),
+    (5.0, 6.5, 4.5),
+    (7.0, 10.0, 6.0),
+]
+_WALL_HEIGHT = 7.0
+_BUG_GAP_Y_MIN = 1.0
+
+_PLAT_X1 = np.array([p[0] for p in _PLATFORMS], dtype=np.float64)
+_PLAT_X2 = np.array([p[1] for p in _PLATFORMS], dtype=np.float64)
+_PLAT_TOP = np.array([p[2] + _PLATFORM_THICKNESS for p in _PLATFORMS], dtype=np.float64)
+# Aggregate x-span of all platforms for broad-phase early rejects
+_PLAT_X_MIN = float(_PLAT_X1.min())
+_PLAT_X_MAX = float(_PLAT_X2.max())
+
+# Every standable surface as (y level, x span) rows: ground, platform tops,
+# wall top, bug gap lip. Levels without horizontal gating get +/-inf spans
+# so _on_ground is one broadcasted compare
+_GROUND_Y = np.array([0.0, *_PLAT_TOP, _WALL_HEIGHT, _BUG_GAP_Y_MIN], dtype=np.float64)
+_GROUND_XL = np.array([-np.inf, *_PLAT_X1, -np.inf, -np.inf], dtype=np.float64)
+_GROUND_XR = np.array([np.inf, *_PLAT_X2, np.inf, np.inf], dtype=np.float64)
+
+for _arr in (_PLAT_X1, _PLAT_X2, _PLAT_TOP, _GROUND_Y, _GROUND_XL, _GROUND_XR):
+    _arr.setflags(write=False)
+
+
+class BugPlatformEnv(gym.Env):
+    """
+    Simple 2D platformer with:
+    - A square player that can move left/right and jump.
+    - A wall with a tiny "buggy" gap where collision fails.
+    - A flag to the right (reaching it as fast as possible is the player's objective).
+    - Platforms to the left of the wall allow a "legitimate" way to jump -> over <- the wall.
+    """
+    metadata = {"render.modes": ["human", "rgb_array"]}
+
+    def __init__(self):
+        super().__init__()
+
+        # --- Environment constants ---
+
+        # Misc
+        self.speed_factor = 0.1  # The higher the value, higher the reward for reaching the flag quickly
+        self.jump_cooldown_max = 60
+        self._inv_jump_cd_max = 1.0 / self.jump_cooldown_max  # Saves a divide per obs
+
+        # Player
+        self.player_width = 0.6  # 0.6 because in render_env.py "player_size" is 18 and world scale is 30 (0.6 * 30 = 18)
+        self.player_height = 0.6
+        self.player_half_width = self.player_width / 2  # Helps so self.player_width / 2 isn't reused everywhere
+
+        # Physics
+        self.dt = 0.02
+        self.max_steps = 1000
+        self.gravity = -30.0
+        self.move_speed = 4.0
+        self.jump_speed = 12.0
+        # vx per movement action (0 = stand, 1 = left, 2 = right)
+        self._vx_lut = np.array([0.0, -self.move_speed, self.move_speed], dtype=np.float64)
+
+        # Level layout
+        self.start_x = 1.0
+        self.start_y = 0.0
+        self.flag_x = 20.0
+        self.flag_y = 0.0
+
+        # Wall position and fake bug gap
+        self.wall_x = 10.0
+        self.wall_width = 0.6
+        self.wall_height = _WALL_HEIGHT
+        self.bug_gap_y_min = _BUG_GAP_Y_MIN   # Only in this vertical band can you "phase" through the wall (as if it's not there)
+        self.bug_gap_y_max = 3.0
+        # Wall boundaries are invariants, hoisted out of step()
+        self._wall_left = self.wall_x - self.wall_width * 0.5
+        self._wall_right = self.wall_x + self.wall_width * 0.5
+
+        # Platforms to the left of the wall (x_left, x_right, y_top)
+        self.platform_thickness = _PLATFORM_THICKNESS
+        self.platforms = _PLATFORMS
+        # SoA columns and surface table: aliases of the shared read-only
+        # module-level arrays (one instance across all env copies)
+        self._plat_x1 = _PLAT_X1
+        self._plat_x2 = _PLAT_X2
+        self._plat_top = _PLAT_TOP
+        self._plat_x_min = _PLAT_X_MIN
+        self._plat_x_max = _PLAT_X_MAX
+        self._ground_y = _GROUND_Y
+        self._ground_xl = _GROUND_XL
+        self._ground_xr = _GROUND_XR
+
+        # --- State variables ---
+
+
+        # [x, y, vx, vy]
+        low = np.array([-np.inf, -np.inf, -np.inf, -np.inf, 0.0, -np.inf, -np.inf, 0.0], dtype=np.float32)
+        high = np.array([np.inf, np.inf, np.inf, np.inf, 1.0, np.inf, np.inf, 1.0], dtype=np.float32)
+        self.observation_space = spaces.Box(low=low, high=high, dtype=np.float32)
+
+        self.action_space = spaces.MultiDiscrete([3, 2])
+
+        # Mutable episode state as one contiguous float32 buffer
+        # [x, y, vx, vy, jump_cooldown, is_jumping, y_before_jump, prev_jump]
+        # that the kernel mutates in place; self.state aliases slots 0:4.
+        # The obs buffer is likewise preallocated and rewritten every step
+        self._ep = np.zeros(8, dtype=np.float32)
+        self._obs_buf = np.zeros(8, dtype=np.float32)
+
+        # Everything the step kernel takes after the per-step state, bundled
+        # once; step() splats this so it doesn't re-load ~20 attributes from
+        # self on every call
+        self._kernel_args = (
+            self._plat_x1, self._plat_x2, self._plat_top,
+            self._plat_x_min, self._plat_x_max,
+            self._ground_y, self._ground_xl, self._ground_xr,
+            self.dt, self.gravity, self._vx_lut, self.jump_speed,
+            self.jump_cooldown_max, self.player_half_width, self.player_height,
+            self.wall_x, self._wall_left, self._wall_right,
+            self.wall_height, self.bug_gap_y_min, self.bug_gap_y_max,
+            self.flag_x, self.flag_y, self.speed_factor, self.max_steps,
+        )
+
+        self.state = None
+        self.steps = 0
+
+        # For rendering (only used in visualize.py)
+        self._viewer_initialized = False
+
+
+    # -----------------------------------------------------------
+    # Core RL interface (no Pygame - Better training efficiency)
+    # -----------------------------------------------------------
+
+    def reset(self, *, seed=None, options=None):
+        # Resets the environment before each step
+        # The dynamics are deterministic, so Gym's RNG bookkeeping is only
+        # needed when an explicit seed is requested
+        if seed is not None:
+            super().reset(seed=seed)
+
+        ep = self._ep
+        ep[:] = 0.0
+        ep[_EP_X] = self.start_x
+        ep[_EP_Y] = self.start_y
+        self.state = ep[:4]
+
+        self.steps = 0
+        self._grounded_new = self._on_ground(self.start_x, self.start_y)
+
+        # Fresh obs buffer per episode: DummyVecEnv keeps the view returned
+        # on the final step as info["terminal_observation"] and resets the
+        # env right after, so rewriting the old buffer in place would
+        # clobber that terminal obs (one allocation per episode, the
+        # per-step path still writes in place)
+        self._obs_buf = np.zeros(8, dtype=np.float32)
+
+        obs = self._get_obs()
+        info = {} # PLACEHOLDER (potential future logging)
+        return obs, info
+
+
+    def step(self, action):
+        # "Real time" character control and physics logics:
+        # everything happens in the compiled _step_kernel, which mutates the
+        # packed episode state in place; this wrapper only handles the
+        # Gym API types.
+        self.steps += 1
+
+        movement, jump = action
+
+        reward, grounded_new, terminated, truncated = _step_kernel(
+            self._ep, int(movement), int(jump), self.steps,
+            *self._kernel_args,
+        )
+
+        self._grounded_new = bool(grounded_new)
+
+        info = {}
+        obs = self._get_obs()
+
+
+        return obs, float(reward), bool(terminated), bool(truncated), info
+
+    def _get_obs(self):
+        # Eight scalar stores into the preallocated buffer, nothing else;
+        # the buffer is replaced in reset() so the view returned on a done
+        # step survives as the terminal observation
+        ep = self._ep
+        x = ep[_EP_X]
+        b = self._obs_buf
+        b[0] = x
+        b[1] = ep[_EP_Y]
+        b[2] = ep[_EP_VX]
+        b[3] = ep[_EP_VY]
+        b[4] = ep[_EP_JCD] * self._inv_jump_cd_max
+        b[5] = self.flag_x - x
+        b[6] = self.wall_x - x
+        b[7] = self._grounded_new
+        return b
+
+    # Checks if it's standing on a surface: one broadcasted compare over the
+    # unified (y level, x span) surface table built in __init__
+    def _on_ground(self, x, y, eps = 0.001):
+        player_left = x - self.player_half_width
+        player_right = x + self.player_half_width
+
+        hits = (np.abs(y - self._ground_y) < eps) \
+            & (player_right > self._ground_xl) & (player_left < self._ground_xr)
+        return bool(hits.any())
+
+    def _reached_flag(self, x, y):
+        return fabs(x - self.flag_x) < 0.5 and fabs(y - self.flag_y) < 0.5
+
+    # --------------------------------------------------
+    # Rendering: will be implemented with Pygame in visualize.py
+    # --------------------------------------------------
+    def render(self, mode="human"):
+        # Placeholder; in visualize.py you can import Pygame and
+        # implement actual drawing using self.state and level layout.
+        pass
+
+    def close(self):
+        pass
@@ -85,6 +85,10 @@ class BugPlatformEnv(gym.Env):
         self.state = None
         self.steps = 0
 
+        # Observation buffer rewritten in place by _get_obs; reset()
+        # replaces it so steps never allocate
+        self._obs_buf = np.zeros(8, dtype=np.float32)
+
         # For rendering (only used in visualize.py)
         self._viewer_initialized = False
 
@@ -115,7 +119,14 @@ class BugPlatformEnv(gym.Env):
         
         self.recent_x.clear()
         self.recent_x.append(self.start_x)
-        
+
+        # Fresh obs buffer per episode: DummyVecEnv keeps the view returned
+        # on the final step as info["terminal_observation"] and resets the
+        # env right after, so rewriting the old buffer in place would
+        # clobber that terminal obs (one allocation per episode, the
+        # per-step path still writes in place)
+        self._obs_buf = np.zeros(8, dtype=np.float32)
+
         obs = self._get_obs()
         info = {} # PLACEHOLDER (potential future logging)
         return obs, info
@@ -353,15 +364,18 @@ class BugPlatformEnv(gym.Env):
 
     def _get_obs(self):
         x, y, vx, vy = self.state
-        
-        cooldown_norm = self.jump_cooldown / self.jump_cooldown_max
-        
-        distance_to_flag = self.flag_x - x
-        distance_to_wall = self.wall_x - x
-        
-        grounded = 1.0 if self._on_ground(x, y) else 0.0
-        
-        return np.array([x, y, vx, vy, cooldown_norm, distance_to_flag, distance_to_wall, grounded], dtype=np.float32)
+
+        obs = self._obs_buf
+        obs[0] = x
+        obs[1] = y
+        obs[2] = vx
+        obs[3] = vy
+        obs[4] = self.jump_cooldown / self.jump_cooldown_max
+        obs[5] = self.flag_x - x
+        obs[6] = self.wall_x - x
+        obs[7] = 1.0 if self._on_ground(x, y) else 0.0
+
+        return obs
 
     # Checks if it's standing on a surface
     def _on_ground(self, x, y, eps = 0.001):
@@ -1,3 +1,4 @@
+import numpy as np
 from stable_baselines3.common.callbacks import BaseCallback
 
 
@@ -15,13 +16,16 @@ class EpisodeStatsCallback(BaseCallback):
         infos = self.locals.get("infos")
 
         if dones is not None and infos is not None:
-            for done, info in zip(dones, infos):
-                if done:
-                    # TimeLimit.truncated in info
-                    if info.get("TimeLimit.truncated", False):
-                        self.truncated_count += 1
-                    else:
-                        self.terminated_count += 1
+            dones = np.asarray(dones, dtype=bool)
+            if not dones.any():
+                return True
+            # TimeLimit.truncated in info
+            trunc = np.fromiter(
+                (info.get("TimeLimit.truncated", False) for info in infos),
+                dtype=bool, count=len(infos),
+            )
+            self.truncated_count += int((dones & trunc).sum())
+            self.terminated_count += int((dones & ~trunc).sum())
 
         return True
 
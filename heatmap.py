@@ -2,13 +2,43 @@ import sys
 import os
 
 import numpy as np
+import torch as th
 import matplotlib.pyplot as mplot
+from matplotlib import colormaps
+from PIL import Image
 from stable_baselines3 import PPO
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import SubprocVecEnv
 
 from bug_platform_env_v2 import BugPlatformEnv
 from render_env import BugPlatformEnvWithRender
 import pygame
 
+try:
+    # Pure-C uniform-bin histogram, much faster than np.histogram2d and
+    # takes the float32 positions without upcasting
+    from fast_histogram import histogram2d as _fast_histogram2d
+except ImportError:
+    _fast_histogram2d = None
+
+
+def _bincount_histogram2d(xs, ys, bins_x, bins_y,
+                          x_min, x_max, y_min, y_max) -> np.ndarray:
+    # Uniform-bin 2D histogram without np.histogram2d's generic
+    # searchsorted machinery: bins are equal width, so the bin index is
+    # one multiply + truncation, and the counting is one bincount over
+    # flattened (ix, iy) pairs
+    sx = bins_x / (x_max - x_min)
+    sy = bins_y / (y_max - y_min)
+    fx = (xs - x_min) * sx
+    fy = (ys - y_min) * sy
+    # Out-of-range samples are dropped (same as histogram2d with a range)
+    valid = (fx >= 0) & (fx < bins_x) & (fy >= 0) & (fy < bins_y)
+    ix = fx[valid].astype(np.int32)
+    iy = fy[valid].astype(np.int32)
+    counts = np.bincount(ix * bins_y + iy, minlength=bins_x * bins_y)
+    return counts.reshape(bins_x, bins_y).astype(np.float64)
+
 
 def draw_pygame_background() -> np.ndarray:
     env = BugPlatformEnvWithRender()
@@ -21,10 +51,12 @@ def draw_pygame_background() -> np.ndarray:
     scale = env.scale
     offset = 50
     
-    bg = pygame.surfarray.array3d(surface)
-    # imshow() hates numpy arrays
-    bg = np.transpose(bg, (1, 0, 2))
-    bg = np.flipud(bg)
+    # pixels3d is a zero-copy view into the surface (it stays locked while
+    # the view exists), swapaxes is a view too, and the flip + layout that
+    # imshow() wants happen in one contiguous copy
+    px = pygame.surfarray.pixels3d(surface)
+    bg = np.ascontiguousarray(px.swapaxes(0, 1)[::-1])
+    del px  # Releases the surface lock
     
     x_min = (0 - offset) / scale
     x_max = (width - offset) / scale
@@ -40,55 +72,110 @@ def collect_positions(
     n_episodes: int = 500,
     max_steps: int | None = None,
     deterministic: bool = True,
+    num_cpu: int = 8,
 ) -> tuple[np.ndarray, np.ndarray]:
     print(f"Loading model from: {model_path}")
-    model = PPO.load(model_path)
-
-    env = BugPlatformEnv()
-
-    xs = []
-    ys = []
-
-    for ep in range(n_episodes):
-        obs, info = env.reset()
-        done = False
-        steps = 0
-
-        while not done:
-            action, _ = model.predict(obs, deterministic=deterministic)
-
-            # Gets step
-            obs, reward, terminated, truncated, info = env.step(action)
-            done = terminated or truncated
-
-            # Extract position from internal state: [x, y, vx, vy]
-            try:
-                x, y, *_ = env.state
-            except Exception:
-                # In case there is no state
-                x, y = float(obs[0]), float(obs[1])
-            
-            # Center of the player
-            y += env.player_height / 2
-
-            xs.append(x)
-            ys.append(y)
-
-            steps += 1
-            if max_steps is not None and steps >= max_steps:
-                break
-        
-        # Making sure the program is running and isn't frozen
-        if (ep + 1) % 50 == 0:
-            print(f"  Collected {ep + 1}/{n_episodes} episodes")
-
-    env.close()
-    xs = np.array(xs, dtype=np.float32)
-    ys = np.array(ys, dtype=np.float32)
+    # Same batch-size gate as multi_visualize: the lockstep batch is
+    # num_cpu observations, which only earns the GPU round trip once it's
+    # big enough to amortize the kernel-launch overhead
+    use_cuda = th.cuda.is_available() and num_cpu >= 32
+    model = PPO.load(model_path, device="cuda" if use_cuda else "cpu")
+
+    # The rollout is GIL-bound Python stepping, so num_cpu subprocess envs
+    # stepped in lockstep (with one batched predict per step) scale it out
+    vec_env = make_vec_env(BugPlatformEnv, n_envs=num_cpu, vec_env_cls=SubprocVecEnv)
+    player_half_height = vec_env.get_attr("player_height")[0] / 2
+
+    # Preallocated position buffer, written by index: an episode records at
+    # most per_ep_cap rows, and at most num_cpu extra episodes are in
+    # flight when the target count is hit
+    per_ep_cap = vec_env.get_attr("max_steps")[0]
+    if max_steps is not None:
+        per_ep_cap = min(per_ep_cap, max_steps)
+    buf = np.empty(((n_episodes + num_cpu) * per_ep_cap, 2), dtype=np.float32)
+    n = 0
+
+    obs = vec_env.reset()
+
+    # Call the policy net directly through a reusable tensor buffer:
+    # model.predict() re-validates, re-allocates and round-trips through
+    # numpy on every call, which dominates for an MLP this small
+    policy = model.policy
+    policy.set_training_mode(False)
+    obs_t = th.empty(obs.shape, dtype=th.float32, device=policy.device)
+    ep_steps = np.zeros(num_cpu, dtype=np.int64)
+    episodes_done = 0
+
+    while episodes_done < n_episodes:
+        obs_t.copy_(th.from_numpy(obs))
+        with th.no_grad():
+            actions = policy._predict(obs_t, deterministic=deterministic).cpu().numpy()
+        obs, rewards, dones, infos = vec_env.step(actions)
+        ep_steps += 1
+
+        # Positions are the first two obs slots, so no per-step IPC back
+        # into the workers is needed; y is shifted to the player center
+        x = obs[:, 0].copy()
+        y = obs[:, 1] + player_half_height
+
+        for i in range(num_cpu):
+            if dones[i]:
+                # A finished lane's obs is already the reset obs; the real
+                # final position sits in terminal_observation
+                term_obs = infos[i].get("terminal_observation")
+                if term_obs is not None:
+                    x[i] = term_obs[0]
+                    y[i] = term_obs[1] + player_half_height
+
+        if max_steps is not None:
+            # Past the cap an episode keeps running (lockstep lanes can't
+            # reset early) but stops contributing positions
+            within = ep_steps <= max_steps
+            x = x[within]
+            y = y[within]
+        k = x.shape[0]
+        buf[n:n + k, 0] = x
+        buf[n:n + k, 1] = y
+        n += k
+
+        finished = int(dones.sum())
+        if finished:
+            ep_steps[dones] = 0
+            # Making sure the program is running and isn't frozen
+            prev = episodes_done
+            episodes_done += finished
+            if episodes_done // 50 > prev // 50:
+                print(f"  Collected {episodes_done}/{n_episodes} episodes")
+
+    vec_env.close()
+    xs = buf[:n, 0]
+    ys = buf[:n, 1]
     print(f"Total collected positions: {xs.shape[0]}")
     return xs, ys
 
 
+def _save_heatmap_png(bg, heatmap, save_path, alpha=0.6):
+    # Batch-mode save: composite the hot-colormapped heatmap over the
+    # pygame background with plain NumPy and hand the pixels straight to
+    # Pillow; savefig would re-run matplotlib's whole figure render (twice
+    # with a tight bbox) just to produce the same image
+    h, w = bg.shape[:2]
+    peak = heatmap.max()
+    norm = heatmap / peak if peak > 0 else heatmap
+
+    # Nearest-neighbor map from screen pixels to histogram bins (both bg
+    # and heatmap are origin-lower here)
+    rows = (np.arange(h) * heatmap.shape[1]) // h
+    cols = (np.arange(w) * heatmap.shape[0]) // w
+    overlay = colormaps["hot"](norm)[:, :, :3]
+    overlay = overlay[cols][:, rows].swapaxes(0, 1)
+
+    out = (1 - alpha) * bg + alpha * (overlay * 255.0)
+    # PNG rows run top-down, the composite is origin-lower
+    Image.fromarray(np.flipud(out).astype(np.uint8)).save(
+        save_path, optimize=False)
+
+
 def plot_heatmap(
     xs: np.ndarray,
     ys: np.ndarray,
@@ -96,6 +183,7 @@ def plot_heatmap(
     bins_y: int = 120,
     title: str = "State visitation heatmap",
     save_path: str | None = None,
+    show: bool = False,
 ):
     # Debugging
     if xs.size == 0:
@@ -103,15 +191,28 @@ def plot_heatmap(
         return
 
     bg, x_min, x_max, y_min, y_max = draw_pygame_background()
-    
-    heatmap, xedges, yedges = np.histogram2d(
-        xs, ys,
-        bins = [bins_x, bins_y], 
-        range = [[x_min, x_max], [y_min, y_max]],
-    )
 
+    if _fast_histogram2d is not None:
+        heatmap = _fast_histogram2d(
+            xs, ys,
+            bins=[bins_x, bins_y],
+            range=[[x_min, x_max], [y_min, y_max]],
+        )
+    else:
+        heatmap = _bincount_histogram2d(
+            xs, ys, bins_x, bins_y, x_min, x_max, y_min, y_max)
+
+    if save_path is not None:
+        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        _save_heatmap_png(bg, heatmap, save_path)
+        print(f"Heatmap saved to: {save_path}")
+
+    if not show:
+        return
+
+    # Interactive view keeps the full matplotlib figure (axes, colorbar)
     mplot.figure(figsize=(15, 6))
-    
+
     # Pygame map background
     mplot.imshow(
         bg,
@@ -130,25 +231,24 @@ def plot_heatmap(
         alpha=0.6,
         cmap="hot"
     )
-    
+
     mplot.colorbar(label="Position count")
     mplot.xlabel("x (world units)")
     mplot.ylabel("y (world units)")
     mplot.title(title)
 
-    if save_path is not None:
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        mplot.savefig(save_path, bbox_inches="tight")
-        print(f"Heatmap saved to: {save_path}")
-
     mplot.show()
 
 
 def main():
+    # --show opens the interactive matplotlib window on top of the PNG
+    show = "--show" in sys.argv
+    args = [a for a in sys.argv[1:] if a != "--show"]
+
     # Default model path: final trained model
     model_path = "models/ppo_bug_platform"
-    if len(sys.argv) > 1:
-        model_path = f"models/checkpoints/{sys.argv[1]}"
+    if args:
+        model_path = f"models/checkpoints/{args[0]}"
 
     if not os.path.exists(model_path) and not os.path.exists(model_path + ".zip"):
         print(f"Model '{model_path}' not found")
@@ -181,7 +281,8 @@ def main():
         xs, ys,
         bins_x=BINS_X, bins_y=BINS_Y,
         title=title,
-        save_path=save_path
+        save_path=save_path,
+        show=show,
     )
 
 
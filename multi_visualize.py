@@ -2,27 +2,45 @@ import sys
 import time
 
 import numpy as np
+import torch as th
 from stable_baselines3 import PPO
 
-from bug_platform_env_v2 import BugPlatformEnv
 from render_env import BugPlatformEnvWithRender
+from vector_bug_platform_env import VectorBugPlatformEnv
 
 
 def run_multi(model_path: str, n_agents: int = 32, deterministic: bool = False):
     print(f"Loading model from: {model_path}")
-    model = PPO.load(model_path)
-    
-    envs = [BugPlatformEnv() for _ in range(n_agents)]
-    obs_list = []
-    done_list = []
-    
-    for env in envs:
-        obs, info = env.reset()
-        obs_list.append(obs)
-        done_list.append(False)
-    
+    # GPU pays off for the batched forward pass once the batch is big
+    # enough to amortize the kernel-launch overhead; below that the MLP is
+    # faster on CPU
+    use_cuda = th.cuda.is_available() and n_agents >= 32
+    model = PPO.load(model_path, device="cuda" if use_cuda else "cpu")
+
+    # All agents run inside one vectorized env: state is a (n_agents, 4)
+    # array and every frame is one batched step() instead of n_agents
+    # Python-level env steps
+    venv = VectorBugPlatformEnv(n_agents)
+    obs_dim = venv.observation_space.shape[0]
+    obs_batch = venv.reset()
+    done_mask = np.zeros(n_agents, dtype=np.bool_)
+
+    # Call the policy net directly through a reusable tensor buffer:
+    # model.predict() re-validates, re-allocates and round-trips through
+    # numpy on every call, which dominates for an MLP this small
+    policy = model.policy
+    policy.set_training_mode(False)
+    if use_cuda:
+        # Pinned staging buffer so the host-to-device copy can overlap
+        obs_cpu = th.empty((n_agents, obs_dim), dtype=th.float32,
+                           pin_memory=True)
+        obs_t = th.empty((n_agents, obs_dim), dtype=th.float32,
+                         device=policy.device)
+    else:
+        obs_cpu = obs_t = th.empty((n_agents, obs_dim), dtype=th.float32)
+
     renderer = BugPlatformEnvWithRender()
-    
+
     def agent_color(idx: int):
         if idx == 0:
             return (255, 255, 0)
@@ -32,45 +50,76 @@ def run_multi(model_path: str, n_agents: int = 32, deterministic: bool = False):
             return (255, 150, 100)
         else:
             return (180, 255, 180)
-    
+
+    # Pre-filled player surface per agent (shared across agents with the
+    # same color) so the per-frame draw is one batched blits() call
+    renderer._ensure_pygame()
+    surf_by_color = {}
+    agent_surfs = []
+    for j in range(n_agents):
+        color = agent_color(j)
+        if color not in surf_by_color:
+            surf_by_color[color] = renderer.make_player_surface(color)
+        agent_surfs.append(surf_by_color[color])
+
+    # Local binding to skip the per-frame attribute lookups in the loop
+    tick = renderer.clock.tick
+
+    # Adaptive frame skip: the sim steps every iteration, but when the
+    # predict+step work alone blows the 40 FPS budget the scene is only
+    # drawn every render_every-th frame so the display can't throttle the
+    # simulation
+    target_dt = 1.0 / 40.0
+    render_every = 1
+    frame_idx = 0
+
     try:
         while True:
-            positions = []
-            
-            # Step all agents
-            for i, env in enumerate(envs):
-                if done_list[i]:
-                    obs, info = env.reset()
-                    obs_list[i] = obs
-                    done_list[i] = False
-
-                action, _ = model.predict(obs_list[i], deterministic=deterministic)
-                obs, reward, terminated, truncated, info = env.step(action)
-                obs_list[i] = obs
-                done_list[i] = terminated or truncated
-                
-                x, y, vx, vy = env.state
-                positions.append((x, y))
-            
-            # Draw one background frame
-            renderer.debug_text = f"Agents: {n_agents} | deterministic={deterministic}"
-            renderer.draw_background()
-            
-            # Draw all agents
-            for j, (x, y) in enumerate(positions):
-                renderer.draw_player_at(x, y, color=agent_color(j), show_hitbox=False)
-            
-            renderer.clock.tick(40)
-            
-            import pygame  # Late import for efficiency
-            pygame.display.flip()
+            t_start = time.perf_counter()
+
+            # Respawn finished agents first so their action comes from the
+            # fresh observation
+            if done_mask.any():
+                obs_batch = venv.reset(done_mask)
+
+            # One batched forward pass instead of n_agents predict() calls
+            obs_cpu.copy_(th.from_numpy(obs_batch))
+            if use_cuda:
+                obs_t.copy_(obs_cpu, non_blocking=True)
+            with th.no_grad():
+                actions = policy._predict(obs_t, deterministic=deterministic).cpu().numpy()
+
+            # Step all agents in one vectorized call
+            obs_batch, rewards, terminated, truncated = venv.step(actions)
+            done_mask = terminated | truncated
+
+            # Back off rendering while the sim work is over budget,
+            # recover once it has plenty of headroom again
+            work_dt = time.perf_counter() - t_start
+            if work_dt > target_dt:
+                if render_every < 8:
+                    render_every += 1
+            elif render_every > 1 and work_dt < 0.5 * target_dt:
+                render_every -= 1
+
+            if frame_idx % render_every == 0:
+                # Draw one background frame
+                renderer.debug_text = f"Agents: {n_agents} | deterministic={deterministic}"
+                renderer.draw_background()
+
+                # Draw all agents in one batched call
+                rects = renderer.draw_players(venv.state[:, :2], agent_surfs)
+
+                tick(40)
+                # Only the changed regions are pushed to the display
+                renderer.present(rects)
+            frame_idx += 1
     
     except SystemExit:
         pass  # Window is closed
     
     finally:
-        for env in envs:
-            env.close()
+        venv.close()
         renderer.close()
     
     
@@ -1,4 +1,5 @@
 # render_env.py
+import numpy as np
 import pygame
 from bug_platform_env_v2 import BugPlatformEnv
 
@@ -16,6 +17,15 @@ class BugPlatformEnvWithRender(BugPlatformEnv):
         
         self._font = None
         self.debug_text = ""
+        # Static scene rasterized once and blitted every frame
+        self._bg_cache = None
+        # Platform columns as SoA float32 arrays for batched rect math
+        self._plat_arr = np.asarray(self.platforms, dtype=np.float32)
+        # Dirty rects from the previous frame (None until the first
+        # present(); the single-agent render() path never sets it and
+        # keeps doing full flips)
+        self._prev_dirty = None
+        self._text_rect = None
     
     # Pygame helpers
     
@@ -37,33 +47,40 @@ class BugPlatformEnvWithRender(BugPlatformEnv):
         sx = int(wx * self.scale + 50)
         sy = int(self.screen_height - (wy * self.scale + 50))
         return sx, sy
+
+    def _world_to_screen_many(self, wx, wy):
+        # Vectorized variant for the batched paths: one NumPy pass over all
+        # points instead of a Python call (two multiplies + int casts) each
+        sx = (wx * self.scale + 50).astype(np.int32)
+        sy = (self.screen_height - (wy * self.scale + 50)).astype(np.int32)
+        return sx, sy
     
     # Drawing helpers
     
-    def draw_background(self):
-        self._ensure_pygame()
-        self._handle_events()
-        
+    def _draw_static_background(self, surface):
         # Clear background
-        self.screen.fill((30, 30, 30))
-        
+        surface.fill((30, 30, 30))
+
         # ----- Draw ground -----
         gx1, gy1 = self._world_to_screen(-5, 0)
         gx2, gy2 = self._world_to_screen(30, 0)
-        pygame.draw.line(self.screen, (200, 200, 200), (gx1, gy1), (gx2, gy2), 2)
-        
+        pygame.draw.line(surface, (200, 200, 200), (gx1, gy1), (gx2, gy2), 2)
+
         # ----- Draw platforms -----
-        for (px1, px2, py) in self.platforms:
-            sx1, sy1 = self._world_to_screen(px1, py)
-            sx2, sy2 = self._world_to_screen(px2, py + 0.2)  # <---- PLATFORM THICKNESS
+        # Screen-space corners for all platforms in one vectorized pass
+        # (pygame.draw.rect itself has to stay per-rect)
+        plat = self._plat_arr
+        sx1, sy1 = self._world_to_screen_many(plat[:, 0], plat[:, 2])
+        sx2, sy2 = self._world_to_screen_many(plat[:, 1], plat[:, 2] + 0.2)  # <---- PLATFORM THICKNESS
+        for x1, y1, x2, y2 in zip(sx1, sy1, sx2, sy2):
             rect = pygame.Rect(
-                min(sx1, sx2),
-                min(sy1, sy2),
-                abs(sx2 - sx1),
-                abs(sy2 - sy1),
+                min(x1, x2),
+                min(y1, y2),
+                abs(x2 - x1),
+                abs(y2 - y1),
             )
-            pygame.draw.rect(self.screen, (150, 150, 150), rect)
-        
+            pygame.draw.rect(surface, (150, 150, 150), rect)
+
         # ----- Draw wall -----
         wall_left = self.wall_x - self.wall_width / 2
         wall_right = self.wall_x + self.wall_width / 2
@@ -72,8 +89,8 @@ class BugPlatformEnvWithRender(BugPlatformEnv):
         x1, y1 = self._world_to_screen(wall_left, 0)
         x2, y2 = self._world_to_screen(wall_right, wall_top)
         wall_rect = pygame.Rect(min(x1, x2), min(y1, y2), abs(x2 - x1), abs(y2 - y1))
-        pygame.draw.rect(self.screen, (100, 100, 255), wall_rect)
-        
+        pygame.draw.rect(surface, (100, 100, 255), wall_rect)
+
         # ----- Draw bug gap region (outline) -----
         gx1, gy1 = self._world_to_screen(
             self.wall_x - self.wall_width / 2, self.bug_gap_y_min
@@ -82,16 +99,37 @@ class BugPlatformEnvWithRender(BugPlatformEnv):
             self.wall_x + self.wall_width / 2, self.bug_gap_y_max
         )
         gap_rect = pygame.Rect(min(gx1, gx2), min(gy1, gy2), abs(gx2 - gx1), abs(gy2 - gy1))
-        pygame.draw.rect(self.screen, (255, 0, 0), gap_rect, width=1)
+        pygame.draw.rect(surface, (255, 0, 0), gap_rect, width=1)
 
         # ----- Draw flag -----
         fx, fy = self._world_to_screen(self.flag_x, self.flag_y)
         flag_rect = pygame.Rect(fx - 5, fy - 40, 10, 40)
-        pygame.draw.rect(self.screen, (0, 255, 0), flag_rect)
-        
+        pygame.draw.rect(surface, (0, 255, 0), flag_rect)
+
+    def draw_background(self):
+        self._ensure_pygame()
+        self._handle_events()
+
+        # The scene geometry never changes, so it's rasterized once into a
+        # cached surface and blitted per frame; only the debug text (which
+        # can change) is drawn every time
+        if self._bg_cache is None:
+            self._bg_cache = pygame.Surface(
+                (self.screen_width, self.screen_height)).convert()
+            self._draw_static_background(self._bg_cache)
+
+        if self._prev_dirty is None:
+            self.screen.blit(self._bg_cache, (0, 0))
+        else:
+            # Only the regions touched last frame need restoring
+            for r in self._prev_dirty:
+                self.screen.blit(self._bg_cache, r, r)
+
         if self.debug_text:
             text_surface = self._font.render(self.debug_text, True, (255, 255, 200))
-            self.screen.blit(text_surface, (10, 10))
+            self._text_rect = self.screen.blit(text_surface, (10, 10))
+        else:
+            self._text_rect = None
     
     def draw_player_at(self, x, y, color=(255, 255, 0), show_hitbox=True):
         px, py = self._world_to_screen(x, y)
@@ -106,6 +144,44 @@ class BugPlatformEnvWithRender(BugPlatformEnv):
             pygame.draw.rect(self.screen, (255, 0, 50), collision_rect)
 
 
+    def make_player_surface(self, color):
+        # Pre-filled player square for batched drawing (one per color);
+        # convert() matches the display format so blits stay cheap
+        player_size = int(self.player_width * self.scale)
+        surf = pygame.Surface((player_size, player_size))
+        surf.fill(color)
+        return surf.convert()
+
+    def draw_players(self, positions, surfaces):
+        # Batched multi-agent draw: vectorized world->screen for all
+        # positions, then one blits() call instead of two Python calls and
+        # a rect fill per agent
+        pos = np.asarray(positions, dtype=np.float32)
+        player_size = int(self.player_width * self.scale)
+        half = player_size // 2
+        sx, sy = self._world_to_screen_many(pos[:, 0], pos[:, 1])
+        dests = [(sx[j] - half, sy[j] - player_size)
+                 for j in range(pos.shape[0])]
+        self.screen.blits(
+            [(surfaces[j], dests[j]) for j in range(pos.shape[0])],
+            doreturn=False,
+        )
+        return [pygame.Rect(dx, dy, player_size, player_size)
+                for dx, dy in dests]
+
+    def present(self, player_rects):
+        # Push only the regions that changed: last frame's rects (now
+        # restored to background) plus this frame's players and text.
+        # flip() would re-send the whole framebuffer every frame
+        new_dirty = list(player_rects)
+        if self._text_rect is not None:
+            new_dirty.append(self._text_rect)
+        if self._prev_dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._prev_dirty + new_dirty)
+        self._prev_dirty = new_dirty
+
     # Single agent render
     def render(self):
         self.draw_background()
@@ -121,5 +197,8 @@ class BugPlatformEnvWithRender(BugPlatformEnv):
             pygame.quit()
             self.screen = None
             self.clock = None
+            self._bg_cache = None
+            self._prev_dirty = None
+            self._text_rect = None
         super().close()
 
@@ -4,6 +4,7 @@ import multiprocessing as mp
 from stable_baselines3 import PPO
 from stable_baselines3.common.env_util import make_vec_env
 from stable_baselines3.common.callbacks import CheckpointCallback, CallbackList
+from stable_baselines3.common.vec_env import SubprocVecEnv
 
 from episode_stats_callback import EpisodeStatsCallback
 
@@ -14,10 +15,16 @@ def main():
     # Number of parallel environments
     num_cpu = 16   # safer: max(1, mp.cpu_count() // 2)
 
+    # SubprocVecEnv runs each env in its own process; the DummyVecEnv
+    # default steps all 16 serially under the GIL. forkserver keeps worker
+    # startup clean (no inherited training state). n_steps=2048 below
+    # amortizes the per-step IPC across long rollouts
     env = make_vec_env(
         BugPlatformEnv,   # env class, not an instance
         n_envs=num_cpu,
         seed=0,           # base seed; each env gets a different offset
+        vec_env_cls=SubprocVecEnv,
+        vec_env_kwargs=dict(start_method="forkserver"),
     )
 
     # PPO model
@@ -0,0 +1,353 @@
+import numpy as np
+from numba import njit, prange
+
+from bug_platform_env_v2 import BugPlatformEnv
+
+
+# The batched step is one compiled call: prange splits the lanes across
+# threads and the per-lane float32 math vectorizes. All comparison
+# constants are passed as float32 so every branch decision matches the
+# scalar env's np.float32 arithmetic bit for bit.
+
+@njit(cache=True, fastmath=True)
+def _on_ground_kernel(x, y, ground_y, ground_xl, ground_xr,
+                      player_half_width, eps):
+    player_left = x - player_half_width
+    player_right = x + player_half_width
+    for k in range(ground_y.shape[0]):
+        if abs(y - ground_y[k]) < eps:
+            if player_right > ground_xl[k] and player_left < ground_xr[k]:
+                return True
+    return False
+
+
+@njit(parallel=True, cache=True)
+def _vec_step_kernel(state, actions, steps, jump_cooldown, is_jumping,
+                     prev_jump, y_before_jump, rx_buf, rx_count,
+                     out_obs, out_rew, out_term, out_trunc,
+                     plat_x1, plat_x2, plat_top,
+                     ground_y, ground_xl, ground_xr,
+                     vx_lut, vxdt_lut, dt, gravity_dt, jump_speed,
+                     jump_cooldown_max, inv_jump_cd_max,
+                     player_half_width, hitbox_height,
+                     wall_x, wall_left, wall_right, wall_height,
+                     bug_gap_y_min, bug_gap_y_max,
+                     wall_push_left, wall_push_right, gap_ceil_y,
+                     flag_x, flag_y, speed_factor, max_steps,
+                     stagnation_window, stagnation_threshhold):
+    eps = np.float32(0.001)
+    n = state.shape[0]
+    for i in prange(n):
+        steps[i] += 1
+        movement = actions[i, 0]
+        jump = actions[i, 1]
+
+        x = state[i, 0]
+        y = state[i, 1]
+        vy = state[i, 3]
+
+        reward = 0.0
+
+        jcd = jump_cooldown[i]
+        if jcd > 0:
+            jcd -= 1
+
+        # To stop jump spamming
+        reward -= 0.01 * jump
+
+        jump_pressed = jump == 1 and prev_jump[i] == 0
+
+        # Horizontal control
+        vx = vx_lut[movement]
+
+        # Jump: only if "on the ground"
+        if jump_pressed and vy < eps and jcd == 0:
+            if _on_ground_kernel(x, y, ground_y, ground_xl, ground_xr,
+                                 player_half_width, eps):
+                y_before_jump[i] = y
+                is_jumping[i] = True
+                jcd = jump_cooldown_max
+                vy = jump_speed
+
+        # You have to release jump to be able to jump again
+        prev_jump[i] = jump
+
+        # Apply gravity
+        vy = vy + gravity_dt
+
+        # Integrate position
+        x_new = x + vxdt_lut[movement]
+        y_new = y + vy * dt
+
+        # Ground collision
+        if y_new < 0.0:
+            y_new = np.float32(0.0)
+            vy = np.float32(0.0)
+
+        # Platform collision
+        if vy < 0.0:  # "Falling"
+            for k in range(plat_top.shape[0]):
+                top = plat_top[k]
+                if y >= top and y_new <= top:
+                    if (x_new + player_half_width > plat_x1[k]
+                            and x_new - player_half_width < plat_x2[k]):
+                        y_new = top
+                        vy = np.float32(0.0)
+                        break
+
+        # -- Wall collision with a tiny "bug gap" --
+        player_left_new = x_new - player_half_width
+        player_right_new = x_new + player_half_width
+        hitbox_bottom_new = y_new
+        hitbox_top_new = y_new + hitbox_height
+
+        if (player_right_new > wall_left and player_left_new < wall_right
+                and hitbox_bottom_new < wall_height
+                and hitbox_top_new > 0.0):
+            if bug_gap_y_min <= y <= bug_gap_y_max:
+                if hitbox_bottom_new <= bug_gap_y_min:
+                    y_new = bug_gap_y_min
+                    vy = np.float32(0.0)
+                elif hitbox_top_new >= bug_gap_y_max:
+                    y_new = gap_ceil_y
+            elif y >= wall_height:
+                if hitbox_bottom_new <= wall_height:
+                    y_new = wall_height
+                    vy = np.float32(0.0)
+            elif x < wall_x:
+                x_new = wall_push_left
+                vx = np.float32(0.0)
+            else:
+                x_new = wall_push_right
+                vx = np.float32(0.0)
+
+        # Reward: shaped for reaching flag fast
+        dist_prev = abs(flag_x - x)
+        dist_curr = abs(flag_x - x_new)
+
+        reward += (dist_prev - dist_curr) / 5
+        dy = y_new - y
+        if dy > 0:
+            reward += dy / 10
+
+        # Step penalty to encourage speed
+        reward -= 0.005
+
+        # Staying still penalty
+        if abs(vx) < eps:
+            reward -= 0.01
+
+        # Jump penalty/reward
+        grounded = _on_ground_kernel(x_new, y_new, ground_y, ground_xl,
+                                     ground_xr, player_half_width, eps)
+        if is_jumping[i] and grounded and abs(vy) < eps:
+            height_gained = y_new - y_before_jump[i]
+
+            if height_gained < np.float32(-0.2):
+                pass
+            elif height_gained < np.float32(0.2):
+                reward -= 0.4
+            else:
+                reward += 0.2
+
+            is_jumping[i] = False
+
+        # Cycle/stuck penalty: per-lane ring buffer; once full it holds
+        # exactly the last stagnation_window samples
+        w = rx_buf.shape[1]
+        rx_buf[i, rx_count[i] % w] = x_new
+        rx_count[i] += 1
+        if rx_count[i] >= stagnation_window:
+            x_min = rx_buf[i, 0]
+            x_max = rx_buf[i, 0]
+            for k in range(1, w):
+                v = rx_buf[i, k]
+                if v < x_min:
+                    x_min = v
+                elif v > x_max:
+                    x_max = v
+            if (x_max - x_min) < stagnation_threshhold:
+                reward -= 0.03
+
+        terminated = False
+
+        # When to the right of the wall, move right
+        if x_new > wall_x and dist_curr < dist_prev:
+            reward += 0.08
+
+        # Success condition
+        if (abs(x_new - flag_x) < np.float32(0.5)
+                and abs(y_new - flag_y) < np.float32(0.5)):
+            reward += 40.0 + speed_factor * (max_steps - steps[i])
+            terminated = True
+
+        state[i, 0] = x_new
+        state[i, 1] = y_new
+        state[i, 2] = vx
+        state[i, 3] = vy
+        jump_cooldown[i] = jcd
+
+        out_obs[i, 0] = x_new
+        out_obs[i, 1] = y_new
+        out_obs[i, 2] = vx
+        out_obs[i, 3] = vy
+        out_obs[i, 4] = jcd * inv_jump_cd_max
+        out_obs[i, 5] = flag_x - x_new
+        out_obs[i, 6] = wall_x - x_new
+        out_obs[i, 7] = 1.0 if grounded else 0.0
+
+        out_rew[i] = reward
+        out_term[i] = terminated
+        out_trunc[i] = steps[i] >= max_steps
+
+
+class VectorBugPlatformEnv:
+    """
+    N BugPlatformEnv copies stepped as one Numba-compiled batch.
+
+    In-process batching for visualization/evaluation: state lives in a
+    (N, 4) float32 [x, y, vx, vy] array and every step() is one compiled
+    prange pass over the lanes instead of N Python step() calls. The
+    physics and reward logic mirror bug_platform_env_v2 branch for
+    branch, in the same float32 precision, so lanes stay bit-identical
+    to independent scalar envs. reset(done) re-initializes only the
+    lanes where done is True.
+    """
+
+    def __init__(self, num_envs: int = 32):
+        # A template env provides spaces, level layout, and all the physics
+        # constants (single source of truth)
+        self._env = BugPlatformEnv()
+        env = self._env
+        self.num_envs = num_envs
+        self.observation_space = env.observation_space
+        self.action_space = env.action_space
+
+        n = num_envs
+        self._state = np.zeros((n, 4), dtype=np.float32)
+        self._steps = np.zeros(n, dtype=np.int64)
+        self._jump_cooldown = np.zeros(n, dtype=np.int64)
+        self._is_jumping = np.zeros(n, dtype=np.bool_)
+        self._prev_jump = np.zeros(n, dtype=np.int64)
+        self._y_before_jump = np.zeros(n, dtype=np.float32)
+
+        # Cycle/stuck tracking: per-lane ring buffer of the last
+        # stagnation_window x positions
+        self._rx_buf = np.zeros((n, env.stagnation_window), dtype=np.float32)
+        self._rx_count = np.zeros(n, dtype=np.int64)
+
+        self._obs = np.zeros((n, 8), dtype=np.float32)
+        self._rewards = np.zeros(n, dtype=np.float64)
+        self._terminated = np.zeros(n, dtype=np.bool_)
+        self._truncated = np.zeros(n, dtype=np.bool_)
+
+        f32 = np.float32
+
+        # Platform columns (top edge precomputed)
+        plat = np.asarray(env.platforms, dtype=np.float32)
+        plat_x1 = plat[:, 0].copy()
+        plat_x2 = plat[:, 1].copy()
+        plat_top = np.asarray(
+            [py + env.platform_thickness for (_, _, py) in env.platforms],
+            dtype=np.float32)
+
+        # Unified standable-surface table for the grounded check: ground,
+        # platform tops, wall top and gap floor as (y, x_left, x_right)
+        # rows; +-inf spans for surfaces without an x gate
+        ground_y = np.concatenate(
+            ([0.0], plat_top, [env.wall_height], [env.bug_gap_y_min])
+        ).astype(np.float32)
+        ground_xl = np.concatenate(
+            ([-np.inf], plat_x1, [-np.inf], [-np.inf])).astype(np.float32)
+        ground_xr = np.concatenate(
+            ([np.inf], plat_x2, [np.inf], [np.inf])).astype(np.float32)
+
+        # movement -> vx lookup (0: idle, 1: left, 2: right), plus the
+        # per-step x increment with the vx * dt product taken in float64
+        # first (matching the scalar env's Python-float product)
+        vx_lut = np.array([0.0, -env.move_speed, env.move_speed],
+                          dtype=np.float32)
+        vxdt_lut = np.array(
+            [0.0, -env.move_speed * env.dt, env.move_speed * env.dt],
+            dtype=np.float32)
+
+        wall_left = env.wall_x - (env.wall_width / 2)
+        wall_right = env.wall_x + (env.wall_width / 2)
+
+        self._kernel_args = (
+            plat_x1, plat_x2, plat_top,
+            ground_y, ground_xl, ground_xr,
+            vx_lut, vxdt_lut,
+            f32(env.dt), f32(env.gravity * env.dt), f32(env.jump_speed),
+            env.jump_cooldown_max, 1.0 / env.jump_cooldown_max,
+            f32(env.player_half_width), f32(env.hitbox_height),
+            f32(env.wall_x), f32(wall_left), f32(wall_right),
+            f32(env.wall_height),
+            f32(env.bug_gap_y_min), f32(env.bug_gap_y_max),
+            f32(wall_left - env.player_half_width),
+            f32(wall_right + env.player_half_width),
+            f32(env.bug_gap_y_max - env.hitbox_height),
+            f32(env.flag_x), f32(env.flag_y),
+            env.speed_factor, env.max_steps,
+            env.stagnation_window, f32(env.stagnation_threshhold),
+        )
+
+        # Compile the kernel up front so the first rendered frame doesn't
+        # pay the JIT latency
+        self.reset()
+        _vec_step_kernel(self._state, np.zeros((n, 2), dtype=np.int64),
+                         self._steps, self._jump_cooldown, self._is_jumping,
+                         self._prev_jump, self._y_before_jump,
+                         self._rx_buf, self._rx_count,
+                         self._obs, self._rewards, self._terminated,
+                         self._truncated, *self._kernel_args)
+        self.reset()
+
+    @property
+    def state(self):
+        # (N, 4) [x, y, vx, vy] block; rows are lanes
+        return self._state
+
+    def reset(self, done=None):
+        # Re-initializes the lanes where done is True (all lanes when done
+        # is None) and returns the shared observation buffer
+        env = self._env
+        if done is None:
+            done = np.ones(self.num_envs, dtype=np.bool_)
+        else:
+            done = np.asarray(done, dtype=np.bool_)
+
+        st = self._state
+        st[done, 0] = env.start_x
+        st[done, 1] = env.start_y
+        st[done, 2] = 0.0
+        st[done, 3] = 0.0
+
+        self._steps[done] = 0
+        self._jump_cooldown[done] = 0
+        self._is_jumping[done] = False
+        self._prev_jump[done] = 0
+        self._y_before_jump[done] = 0.0
+        self._rx_buf[done, 0] = env.start_x
+        self._rx_count[done] = 1
+
+        obs = self._obs
+        obs[done, 0] = env.start_x
+        obs[done, 1] = env.start_y
+        obs[done, 2:5] = 0.0
+        obs[done, 5] = env.flag_x - env.start_x
+        obs[done, 6] = env.wall_x - env.start_x
+        obs[done, 7] = 1.0 if env._on_ground(env.start_x, env.start_y) else 0.0
+        return obs
+
+    def step(self, actions):
+        acts = np.asarray(actions, dtype=np.int64).reshape(self.num_envs, 2)
+        _vec_step_kernel(self._state, acts, self._steps, self._jump_cooldown,
+                         self._is_jumping, self._prev_jump,
+                         self._y_before_jump, self._rx_buf, self._rx_count,
+                         self._obs, self._rewards, self._terminated,
+                         self._truncated, *self._kernel_args)
+        return self._obs, self._rewards, self._terminated, self._truncated
+
+    def close(self):
+        pass
@@ -12,6 +12,10 @@ def play_episodes(model_path: str, n_episodes: int = 1, deterministic: bool = Tr
 
     env = BugPlatformEnvWithRender()
 
+    # Local bindings to skip the per-step attribute lookups in the loop
+    predict = model.predict
+    step = env.step
+
     for ep in range(n_episodes):
         obs, info = env.reset()
         done = False
@@ -21,8 +25,8 @@ def play_episodes(model_path: str, n_episodes: int = 1, deterministic: bool = Tr
         while not done:
             # Model expects obs shape (n_envs, obs_dim) but VecEnv is not used here,
             # so we let SB3 handle the single-env case.
-            action, _ = model.predict(obs, deterministic=deterministic)
-            obs, reward, terminated, truncated, info = env.step(action)
+            action, _ = predict(obs, deterministic=deterministic)
+            obs, reward, terminated, truncated, info = step(action)
             done = terminated or truncated
             
             ep_reward += reward